@@ -8,7 +8,12 @@
 # License: 3-clause BSD, see https://opensource.org/licenses/BSD-3-Clause
 #
 
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
 
 __VERSION__ = "0.9.0"
 
@@ -16,6 +21,19 @@ long_description: str = ""
 with open("README.md", "r") as read_me_file:
     long_description = read_me_file.read()
 
+# The compiled helpers are optional, nt2dc falls back to pure python
+# if Cython is not available or the extension cannot be built.
+ext_modules = []
+if cythonize is not None:
+    ext_modules = cythonize(
+        [
+            Extension(
+                "nt2dc._fast", ["src/nt2dc/_fast.pyx"], optional=True
+            )
+        ],
+        language_level=3,
+    )
+
 setup(
     name="nt2dc",
     version=__VERSION__,
@@ -29,6 +47,7 @@ setup(
     url="https://github.com/carstencodes/nt2dc",
     install_requires=[],
     package_dir={"": "src"},
+    ext_modules=ext_modules,
     keywords="NamedTuple DataClasses",
     python_requires=">=3.8, < 4",
     classifiers=[
@@ -0,0 +1,37 @@
+#
+# Copyright (c) 2021 Carsten Igel.
+#
+# This file is part of nt2dc
+# (see https://github.com/carstencodes/nt2dc).
+#
+# License: 3-clause BSD, see https://opensource.org/licenses/BSD-3-Clause
+#
+# cython: language_level=3
+"""Optional compiled versions of the per instance helpers of named_tuple.
+"""
+
+from cpython.object cimport PyObject_HasAttrString
+
+
+cpdef bint is_namedtuple_instance(object obj):
+    return (
+        isinstance(obj, tuple)
+        and PyObject_HasAttrString(obj, b"_asdict")
+        and PyObject_HasAttrString(obj, b"_fields")
+    )
+
+
+cpdef list narrow_instance(object instance, tuple plan):
+    # instance is not typed as tuple, since Cython would only accept exact
+    # tuples then and reject named tuples.
+    cdef list result = []
+    cdef Py_ssize_t index
+    cdef object converter
+    for index in range(len(plan)):
+        converter = plan[index]
+        if converter is None:
+            result.append(instance[index])
+        else:
+            result.append(converter(instance[index]))
+
+    return result
@@ -55,44 +55,3 @@ BuiltInReplacements: typing.Dict[typing.Type, typing.Type] = {
     contextlib.AbstractContextManager: typing.ContextManager,
     contextlib.AbstractAsyncContextManager: typing.AsyncContextManager,
 }
-
-BuiltInNames: typing.Dict[typing.Type, str] = {
-    typing.Tuple: "typing.Tuple",
-    typing.Callable: "typing.Callable",
-    typing.Type: "typing.Type",
-    typing.Dict: "typing.Dict",
-    typing.List: "typing.List",
-    typing.FrozenSet: "typing.FrozenSet",
-    typing.DefaultDict: "typing.DefaultDict",
-    typing.OrderedDict: "typing.OrderedDict",
-    typing.ChainMap: "typing.ChainMap",
-    typing.Counter: "typing.Counter",
-    typing.Deque: "typing.Deque",
-    typing.Pattern: "typing.Pattern",
-    typing.Match: "typing.Match",
-    typing.Set: "typing.Set",
-    typing.ByteString: "typing.ByteString",
-    typing.Collection: "typing.Collection",
-    typing.Container: "typing.Container",
-    typing.ItemsView: "typing.ItemsView",
-    typing.KeysView: "typing.KeysView",
-    typing.Mapping: "typing.Mapping",
-    typing.MappingView: "typing.MappingView",
-    typing.MutableMapping: "typing.MutableMapping",
-    typing.MutableSequence: "typing.MutableSequence",
-    typing.MutableSet: "typing.MutableSet",
-    typing.Sequence: "typing.Sequence",
-    typing.ValuesView: "typing.ValuesView",
-    typing.Iterable: "typing.Iterable",
-    typing.Iterator: "typing.Iterator",
-    typing.Generator: "typing.Generator",
-    typing.Reversible: "typing.Reversible",
-    typing.Coroutine: "typing.Coroutine",
-    typing.AsyncGenerator: "typing.AsyncGenerator",
-    typing.AsyncIterable: "typing.AsyncIterable",
-    typing.AsyncIterator: "typing.AsyncIterator",
-    typing.Awaitable: "typing.Awaitable",
-    typing.ContextManager: "typing.ContextManager",
-    typing.AsyncContextManager: "typing.AsyncContextManager",
-    typing.Union: "typing.Union",
-}
@@ -10,32 +10,44 @@
 """
 
 from typing import (
+    Callable,
     FrozenSet,
     Optional,
     Set,
     Mapping,
+    MutableMapping,
     Type,
     NamedTuple,
     Tuple,
     List,
     Any,
     Dict,
+    ForwardRef,
     get_type_hints,
     get_args,
     get_origin,
 )
 from dataclasses import make_dataclass as make_real_dataclass
-from collections.abc import Iterable
+from functools import partial
+from inspect import isabstract
+from weakref import WeakKeyDictionary
 from sys import version_info as python_version
-from importlib import import_module
 
-from .builtins import BuiltInReplacements, BuiltInNames
+from .builtins import BuiltInReplacements
 
 
 __BUILT_IN_REPLACEMENTS__ = None
 if python_version.major == 3 and python_version.minor < 9:
     __BUILT_IN_REPLACEMENTS__ = BuiltInReplacements
 
+# Instances of slotted dataclasses need less memory and provide faster
+# attribute access. The slots option is available since python 3.10, but
+# slotted instances support weak references only since python 3.11.
+_DATACLASS_OPTIONS: Dict[str, Any] = {}
+if python_version.major == 3 and python_version.minor >= 11:
+    _DATACLASS_OPTIONS["slots"] = True
+    _DATACLASS_OPTIONS["weakref_slot"] = True
+
 __BUILT_IN_CONSTRUCTORS__ = {
     List: list,
     Dict: dict,
@@ -44,21 +56,151 @@ __BUILT_IN_CONSTRUCTORS__ = {
     Tuple: tuple,
 }
 
+_COLLECTION_TYPES: Tuple[Type, ...] = (list, tuple, set, frozenset)
+
+_SCALAR_TYPES: FrozenSet[Type] = frozenset(
+    {int, float, bool, str, bytes, complex, type(None)}
+)
+
+_Converter = Callable[[Any], Any]
+_NarrowingPlan = Tuple[Optional[_Converter], ...]
+
+_CacheKey = Tuple[Any, ...]
+_CacheEntry = Tuple[Optional[Mapping[Type, Type]], Any]
+_Cache = MutableMapping[Type, Dict[_CacheKey, _CacheEntry]]
 
-_type_cache: Dict[Type, Type] = {}
+_Target = Tuple[Optional[Mapping[Type, Type]], Type, _NarrowingPlan]
+_TARGET_ATTRIBUTE = "__nt_as_dc_target__"
+
+_type_cache: _Cache = WeakKeyDictionary()
+_plan_cache: _Cache = WeakKeyDictionary()
+_hints_cache: "WeakKeyDictionary[Type, Dict[str, Type]]" = WeakKeyDictionary()
 
 
 def clear_cache() -> None:
     """Clears the cache of generated classes.
     """
+    for clz in list(_plan_cache.keys()):
+        if _TARGET_ATTRIBUTE in clz.__dict__:
+            delattr(clz, _TARGET_ATTRIBUTE)
+
     _type_cache.clear()
+    _plan_cache.clear()
+    _hints_cache.clear()
+
+
+def _cached_type_hints(clz: Type) -> Dict[str, Type]:
+    # The type hints of a named tuple cannot change after its creation.
+    hints: Optional[Dict[str, Type]] = _hints_cache.get(clz)
+    if hints is None:
+        hints = _get_type_hints(clz)
+        _hints_cache[clz] = hints
+
+    return hints
+
+
+def _get_type_hints(clz: Type) -> Dict[str, Type]:
+    annotations: Optional[Dict[str, Any]] = clz.__dict__.get(
+        "__annotations__"
+    )
+    # get_type_hints is only required to resolve forward references and to
+    # strip Annotated from the hints.
+    if (
+        annotations
+        and tuple(annotations) == getattr(clz, "_fields", None)
+        and all(_is_resolved(v) for v in annotations.values())
+    ):
+        return dict(annotations)
+
+    return get_type_hints(clz)
+
+
+def _is_resolved(hint: Any) -> bool:
+    # Annotated hints provide their extra arguments as __metadata__
+    if (
+        hint is None
+        or isinstance(hint, (str, ForwardRef))
+        or hasattr(hint, "__metadata__")
+    ):
+        return False
+
+    if isinstance(hint, list):
+        return all(_is_resolved(h) for h in hint)
+
+    return all(_is_resolved(h) for h in get_args(hint))
+
+
+def _get_cache_key(
+    generic_type_mapping: Optional[Mapping[Type, Type]], *names: str
+) -> _CacheKey:
+    mapping_id: int = id(generic_type_mapping) if generic_type_mapping else 0
+    return (mapping_id,) + names
+
+
+def _is_same_mapping(
+    mapping: Optional[Mapping[Type, Type]],
+    other: Optional[Mapping[Type, Type]],
+) -> bool:
+    # An empty mapping is equivalent to no mapping at all
+    return mapping is other or (not mapping and not other)
+
+
+def _get_from_cache(
+    cache: _Cache,
+    clz: Type,
+    generic_type_mapping: Optional[Mapping[Type, Type]],
+    cache_key: _CacheKey,
+) -> Optional[Any]:
+    bucket: Optional[Dict[_CacheKey, _CacheEntry]] = cache.get(clz)
+    if bucket is None:
+        return None
+
+    entry: Optional[_CacheEntry] = bucket.get(cache_key)
+    if entry is None:
+        return None
+
+    # The mapping is stored along with the result, since the id of a mapping
+    # might be re-used once the original mapping has been garbage collected.
+    if not _is_same_mapping(entry[0], generic_type_mapping):
+        return None
+
+    return entry[1]
+
+
+def _add_to_cache(
+    cache: _Cache,
+    clz: Type,
+    generic_type_mapping: Optional[Mapping[Type, Type]],
+    cache_key: _CacheKey,
+    value: Any,
+) -> None:
+    cache.setdefault(clz, {})[cache_key] = (generic_type_mapping, value)
+
+
+def _is_namedtuple_class(clz: Type) -> bool:
+    return (
+        isinstance(clz, type)
+        and issubclass(clz, tuple)
+        and hasattr(clz, "_asdict")
+        and hasattr(clz, "_fields")
+    )
+
+
+def _make_generic_type(generic_base: Type, generic_args: List[Type]) -> Type:
+    # Subscribing the base type works for both typing generics like
+    # typing.Dict[str, int] and builtin generics like dict[str, int].
+    if len(generic_args) == 1:
+        return generic_base[generic_args[0]]
 
+    return generic_base[tuple(generic_args)]
 
-def _get_from_cache(clz: Type) -> Optional[Type]:
-    if clz in _type_cache.keys():
-        return _type_cache[clz]
 
-    return None
+def _build_resolved_type(value: Any, children: List[Type]) -> Any:
+    if isinstance(value, list):
+        # the parameter list of a Callable
+        return children
+
+    return _make_generic_type(children[0], children[1:])
 
 
 def make_dataclass(
@@ -67,7 +209,7 @@ def make_dataclass(
     *,
     prefix: str = "",
     suffix: str = "DataClass",
-    use_cache: bool = False,
+    use_cache: bool = True,
 ) -> Type[object]:
     """Creates a dataclass from the specified named tuple.
 
@@ -76,229 +218,409 @@ def make_dataclass(
         generic_type_mapping (Mapping[Type, Type], optional): An
             optional mapping of source types to target types, e.g. from set
             to list. Defaults to None.
+        prefix (str, optional): The prefix of the dataclass name.
+            Defaults to "".
+        suffix (str, optional): The suffix of the dataclass name.
+            Defaults to "DataClass".
+        use_cache (bool, optional): Whether to re-use a dataclass that has
+            been created for the same arguments before. Defaults to True.
 
     Returns:
         Type[object]: The dataclass.
     """
+    cache_key: _CacheKey = _get_cache_key(generic_type_mapping, prefix, suffix)
     if use_cache:
-        result: Type = _get_from_cache(clz)
+        result: Optional[Type] = _get_from_cache(
+            _type_cache, clz, generic_type_mapping, cache_key
+        )
         if result is not None:
             return result
-    type_hints: List[Tuple[str, Type]] = []
-    for key, value in get_type_hints(clz).items():
-        value = _get_target_data_type_dc(value, generic_type_mapping)
-        type_hints.append((key, value))
 
-    target_name: str = "{}{}{}".format(prefix, clz.__name__, suffix)
-    result_class: Type = make_real_dataclass(target_name, type_hints)
+    # Helpers are bound as default arguments, so that they are looked up as
+    # locals rather than globals for every resolved type.
+    def _resolve(
+        root: Type,
+        _get_args=get_args,
+        _get_origin=get_origin,
+        _is_nt=_is_namedtuple_class,
+        _build=_build_resolved_type,
+        _scalars=_SCALAR_TYPES,
+    ) -> Type:
+        # Generic types are resolved in post-order using an explicit stack:
+        # A generic type is pushed as a marker with the number of its
+        # resolved children (the origin and the arguments), followed by the
+        # children. Once the marker is popped again, the children have been
+        # resolved and are taken from the results to build the generic type.
+        # The parameter list of a Callable is handled the same way.
+        # Unresolved types are pushed with a child count of -1.
+        stack: List[Tuple[Type, int]] = [(root, -1)]
+        results: List[Type] = []
+        while stack:
+            value, num_children = stack.pop()
+            if num_children >= 0:
+                first_child: int = len(results) - num_children
+                children: List[Type] = results[first_child:]
+                del results[first_child:]
+                results.append(_build(value, children))
+            elif isinstance(value, list):
+                stack.append((value, len(value)))
+                stack.extend((item, -1) for item in reversed(value))
+            elif value in _scalars:
+                results.append(value)
+            else:
+                args: Tuple = _get_args(value)
+                if len(args) > 0:
+                    origin: Type = _get_origin(value)
+                    if generic_type_mapping is not None:
+                        origin = generic_type_mapping.get(origin, origin)
+                    stack.append((value, len(args) + 1))
+                    stack.extend((arg, -1) for arg in reversed(args))
+                    stack.append((origin, -1))
+                elif _is_nt(value):
+                    results.append(
+                        make_dataclass(
+                            value,
+                            generic_type_mapping,
+                            prefix=prefix,
+                            suffix=suffix,
+                            use_cache=use_cache,
+                        )
+                    )
+                else:
+                    results.append(value)
+
+        return results[0]
+
+    type_hints: List[Tuple[str, Type]] = [
+        (key, _resolve(value))
+        for key, value in _cached_type_hints(clz).items()
+    ]
+
+    target_name: str = f"{prefix}{clz.__name__}{suffix}"
+    result_class: Type = make_real_dataclass(
+        target_name, type_hints, **_DATACLASS_OPTIONS
+    )
     setattr(result_class, "__nt_as_dc", True)
     if use_cache:
-        _type_cache[clz] = result_class
+        _add_to_cache(
+            _type_cache, clz, generic_type_mapping, cache_key, result_class
+        )
     return result_class
 
 
-def _get_target_data_type_dc(
-    value: Type,
-    generic_type_mapping: Mapping[Type, Type] = None,
+def get_dataclass_object(
+    instance: NamedTuple,
+    generic_type_mapping: Mapping[Type, Type] = __BUILT_IN_REPLACEMENTS__,
     *,
-    prefix: str = "",
-    suffix: str = "",
-    use_cache: bool = False,
-) -> Type:
-    args: Tuple = get_args(value)
-    if len(args) > 0:
-        items: List[Type] = []
-        for arg in args:
-            arg = _get_target_data_type_dc(
-                arg,
-                generic_type_mapping,
-                prefix=prefix,
-                suffix=suffix,
-                use_cache=use_cache,
-            )
-            items.append(arg)
-
-        origin: Type = get_origin(value)
-        if (
-            generic_type_mapping is not None
-            and origin in generic_type_mapping.keys()
+    use_cache: bool = True,
+) -> Tuple[object, Type[object]]:
+    """Creates a dataclass object from the specified named tuple instance.
+
+    Args:
+        instance (NamedTuple): The instance to create a dataclass instance
+            from.
+        generic_type_mapping (Mapping[Type, Type], optional): An
+            optional mapping of source types to target types, e.g. from set
+            to list. Defaults to None.
+        use_cache (bool, optional): Whether to re-use a dataclass that has
+            been created for the same arguments before. Defaults to True.
+
+    Returns:
+        Tuple[object, Type[object]]: The converted instance and its new type.
+    """
+    clz: Type = instance.__class__
+    target_type: Optional[Type[object]] = None
+    plan: Optional[_NarrowingPlan] = None
+    if use_cache:
+        # Only the class itself is looked at, subclasses of a named tuple
+        # must not use the target of their base class.
+        target: Optional[_Target] = clz.__dict__.get(_TARGET_ATTRIBUTE)
+        if target is not None and _is_same_mapping(
+            target[0], generic_type_mapping
         ):
-            origin = generic_type_mapping[origin]
-        origin = _get_target_data_type_dc(
-            origin,
-            generic_type_mapping,
-            prefix=prefix,
-            suffix=suffix,
-            use_cache=use_cache,
+            _, target_type, plan = target
+
+    if target_type is None:
+        target_type = make_dataclass(
+            clz, generic_type_mapping, use_cache=use_cache
         )
-        value = _make_generic_type(
-            origin,
-            items,
-            generic_type_mapping=generic_type_mapping,
-            prefix=prefix,
-            suffix=suffix,
-            use_cache=use_cache,
+        plan = _get_narrowing_plan(
+            clz, generic_type_mapping, use_cache=use_cache
         )
-    elif _is_namedtuple_class(value):
-        value = make_dataclass(
-            value,
+        if use_cache:
+            target = (generic_type_mapping, target_type, plan)
+            setattr(clz, _TARGET_ATTRIBUTE, target)
+
+    # The fields of the dataclass are in the same order as the fields of the
+    # named tuple, so the values can be passed by position.
+    items_narrowed: List[Any] = _narrow_instance(instance, plan)
+    new_instance: object = target_type(*items_narrowed)
+
+    return (new_instance, target_type)
+
+
+def _narrow_instance(instance: Any, plan: _NarrowingPlan) -> List[Any]:
+    return [
+        converter(value) if converter is not None else value
+        for converter, value in zip(plan, instance)
+    ]
+
+
+def _get_narrowing_plan(
+    clz: Type,
+    generic_type_mapping: Mapping[Type, Type] = __BUILT_IN_REPLACEMENTS__,
+    *,
+    use_cache: bool = True,
+) -> _NarrowingPlan:
+    cache_key: _CacheKey = _get_cache_key(generic_type_mapping)
+    if use_cache:
+        plan: Optional[_NarrowingPlan] = _get_from_cache(
+            _plan_cache, clz, generic_type_mapping, cache_key
+        )
+        if plan is not None:
+            return plan
+
+    # The plan covers all fields, so that no value of an untyped field is
+    # dropped when the plan is zipped with an instance.
+    type_hints: Dict[str, Type] = _cached_type_hints(clz)
+    plan = tuple(
+        _compile_converter(
+            type_hints[name], generic_type_mapping, use_cache=use_cache
+        )
+        if name in type_hints
+        else None
+        for name in clz._fields
+    )
+    if use_cache:
+        _add_to_cache(_plan_cache, clz, generic_type_mapping, cache_key, plan)
+    return plan
+
+
+def _compile_converter(
+    hint: Type,
+    generic_type_mapping: Mapping[Type, Type] = __BUILT_IN_REPLACEMENTS__,
+    *,
+    use_cache: bool = True,
+) -> Optional[_Converter]:
+    if hint in _SCALAR_TYPES:
+        return None
+
+    # e.g. Any, Optional or an untyped list: decide by the actual value
+    fallback: _Converter = partial(
+        _narrow_value,
+        generic_type_mapping=generic_type_mapping,
+        use_cache=use_cache,
+    )
+    expected_type: Optional[Type] = hint
+    converter: Optional[_Converter] = partial(
+        _convert_named_tuple,
+        generic_type_mapping=generic_type_mapping,
+        use_cache=use_cache,
+    )
+    if not _is_namedtuple_class(hint):
+        expected_type = _get_expected_type(hint)
+        if expected_type is None:
+            return fallback
+
+        converter = _compile_container_converter(
+            expected_type,
+            get_args(hint),
             generic_type_mapping,
-            prefix=prefix,
-            suffix=suffix,
+            fallback,
             use_cache=use_cache,
         )
+        if converter is None or converter is fallback:
+            return converter
 
-    return value
+    def convert(value: Any) -> Any:
+        # Values that do not match the hint, e.g. None as default value, are
+        # converted by their actual type.
+        if value.__class__ is not expected_type:
+            return fallback(value)
 
+        return converter(value)
 
-def _make_generic_type(
-    generic_base: Type,
-    generic_args: List[Type],
-    *,
-    generic_type_mapping: Mapping[Type, Type] = None,
-    prefix: str = "",
-    suffix: str = "",
-    use_cache: bool = False,
-) -> Type:
-    _globals: Dict[str, Any] = {}
+    return convert
 
-    def get_module(module_name: str) -> Optional[Any]:
-        if len(module_name) == 0:
-            return None
-
-        module: Any = import_module(module_name)
-        _globals[module_name] = module
-        recurse_module_name: str = ""
-        if hasattr(module, "__module__"):
-            recurse_module_name = module.__module__
-        elif hasattr(module, "__package__"):
-            recurse_module_name = module.__package__
 
-        if len(recurse_module_name) > 0 and recurse_module_name != module_name:
-            _ = get_module(recurse_module_name)
+def _convert_named_tuple(
+    value: Any,
+    generic_type_mapping: Mapping[Type, Type] = __BUILT_IN_REPLACEMENTS__,
+    *,
+    use_cache: bool = True,
+) -> Any:
+    new_instance, _ = get_dataclass_object(
+        value, generic_type_mapping, use_cache=use_cache
+    )
+    return new_instance
 
-        return module
 
-    def qualname(queried_type) -> str:
-        if hasattr(queried_type, "__nt_as_dc") and bool(
-            getattr(queried_type, "__nt_as_dc")
-        ):
-            _globals[queried_type.__name__] = queried_type
-            return queried_type.__name__
+def _get_expected_type(hint: Type) -> Optional[Type]:
+    origin: Optional[Type] = get_origin(hint)
+    if origin is None and isinstance(hint, type):
+        origin = hint
+    if (
+        hint is Any
+        or not isinstance(origin, type)
+        or (issubclass(origin, _COLLECTION_TYPES) and len(get_args(hint)) == 0)
+    ):
+        return None
 
-        prefix: str = ""
-        if hasattr(queried_type, "__module__"):
-            module: Optional[Any] = get_module(queried_type.__module__)
-            if module is not None:
-                prefix = "{}.".format(module.__name__)
-        if queried_type in BuiltInNames.keys():
-            return BuiltInNames[queried_type]
+    return origin
 
-        if hasattr(queried_type, "__qualname__"):
-            return prefix + queried_type.__qualname__
 
-        if hasattr(queried_type, "__name__"):
-            return prefix + queried_type.__name__
+def _compile_container_converter(
+    origin: Type,
+    args: Tuple,
+    generic_type_mapping: Mapping[Type, Type],
+    fallback: _Converter,
+    *,
+    use_cache: bool = True,
+) -> Optional[_Converter]:
+    items_converter: Optional[_Converter] = None
+    if issubclass(origin, _COLLECTION_TYPES):
+        items_converter = _compile_items_converter(
+            origin, args, generic_type_mapping, use_cache=use_cache
+        )
+    elif origin is dict and len(args) == 2:
+        items_converter = _compile_values_converter(
+            args[1], generic_type_mapping, use_cache=use_cache
+        )
 
-        return str(queried_type)
+    ctor: Optional[_Converter] = None
+    if generic_type_mapping is not None:
+        target_type: Optional[Type] = generic_type_mapping.get(origin)
+        if target_type is not None:
+            ctor = _get_constructor(target_type)
+            if ctor is None:
+                # e.g. typing.Sequence cannot be instantiated
+                return fallback
+
+    if items_converter is None:
+        # The constructor is applied even if it is the type of the value,
+        # so that the dataclass gets a copy of a mapped container.
+        return ctor
+    if ctor is None or not issubclass(origin, (list, tuple, dict)):
+        # dataclass instances are not hashable, sets of them became lists
+        return items_converter
+
+    return lambda value: ctor(items_converter(value))
+
+
+def _compile_items_converter(
+    origin: Type,
+    args: Tuple,
+    generic_type_mapping: Mapping[Type, Type] = __BUILT_IN_REPLACEMENTS__,
+    *,
+    use_cache: bool = True,
+) -> Optional[_Converter]:
+    is_tuple: bool = issubclass(origin, tuple)
+    if is_tuple and not (len(args) == 2 and args[1] is Ellipsis):
+        converters: Tuple[Optional[_Converter], ...] = tuple(
+            _compile_converter(a, generic_type_mapping, use_cache=use_cache)
+            for a in args
+        )
+        if all(c is None for c in converters):
+            return None
 
-    base_type_name: str = qualname(generic_base)
-    generic_args_dc: List[Type] = [
-        _get_target_data_type_dc(
-            t,
-            generic_type_mapping,
-            prefix=prefix,
-            suffix=suffix,
-            use_cache=use_cache,
+        return lambda value: tuple(
+            c(v) if c is not None else v for c, v in zip(converters, value)
         )
-        for t in generic_args
-    ]
-    generic_arg_names: List[str] = [qualname(t) for t in generic_args_dc]
-    generic_arg_names_value = ", ".join(generic_arg_names)
-    target_type_qualified_name = "{}[{}]".format(
-        base_type_name, generic_arg_names_value
+
+    converter: Optional[_Converter] = _compile_converter(
+        args[0], generic_type_mapping, use_cache=use_cache
     )
+    if converter is None:
+        return None
 
-    # At this stage, there is no other way than using an eval statement
-    # with a qualified name like list[int] or typing.Dict[str, str]
-    # pylint: disable=W0123
-    result: Type = eval(target_type_qualified_name, _globals)
-    return result
+    if is_tuple:
+        return lambda value: tuple(converter(v) for v in value)
 
+    # dataclass instances are not hashable, hence sets become lists
+    return lambda value: [converter(v) for v in value]
 
-def get_dataclass_object(
-    instance: NamedTuple,
+
+def _compile_values_converter(
+    value_hint: Type,
     generic_type_mapping: Mapping[Type, Type] = __BUILT_IN_REPLACEMENTS__,
     *,
-    use_cache: bool = False,
-) -> Tuple[object, Type[object]]:
-    """Creates a dataclass object from the specified named tuple instance.
-
-    Args:
-        instance (NamedTuple): The instance to create a dataclass instance
-            from.
-        generic_type_mapping (Mapping[Type, Type], optional): An
-            optional mapping of source types to target types, e.g. from set
-            to list. Defaults to None.
-    Returns:
-        Tuple[object, Type[object]]: The converted instance and its new type.
-    """
-    target_type: Type[object] = make_dataclass(
-        instance.__class__, generic_type_mapping, use_cache=use_cache
+    use_cache: bool = True,
+) -> Optional[_Converter]:
+    # Keys are kept as they are, since dataclass instances are not hashable.
+    converter: Optional[_Converter] = _compile_converter(
+        value_hint, generic_type_mapping, use_cache=use_cache
     )
-    items_narrowed: Dict[str, Any] = _narrow_named_tuple_instance(
-        instance, generic_type_mapping
-    )
-    new_instance: object = target_type(**items_narrowed)
+    if converter is None:
+        return None
 
-    return (new_instance, target_type)
+    return lambda value: {k: converter(v) for k, v in value.items()}
 
 
-def _narrow_named_tuple_instance(
-    instance: Any,
+def _narrow_value(
+    value: Any,
     generic_type_mapping: Mapping[Type, Type] = __BUILT_IN_REPLACEMENTS__,
-) -> Dict[str, Any]:
-    result: Dict[str, Any] = {}
-    for key, value in instance._asdict().items():
-        key_type: Type = type(value)
-        if value is NamedTuple:
-            value = _narrow_named_tuple_instance(value, generic_type_mapping)
-        elif value is Iterable:
-            items = {v is NamedTuple for v in value}
-            if True in items:
-                narrowed_items = []
-                for item in value:
-                    narrowed_items.append(
-                        _narrow_named_tuple_instance(
-                            item, generic_type_mapping
-                        )
-                    )
-
-                value = narrowed_items
+    *,
+    use_cache: bool = True,
+) -> Any:
+    key_type: Type = type(value)
+    if _is_namedtuple_instance(value):
+        value, _ = get_dataclass_object(
+            value, generic_type_mapping, use_cache=use_cache
+        )
+    elif (
+        isinstance(value, _COLLECTION_TYPES)
+        and len(value) > 0
+        # collections are expected to be homogeneous, like their type hints
+        and _is_namedtuple_instance(next(iter(value)))
+    ):
+        narrowed_items: List[Any] = [
+            _narrow_value(v, generic_type_mapping, use_cache=use_cache)
+            for v in value
+        ]
+        if not isinstance(value, (list, tuple)):
+            # dataclass instances are not hashable, hence sets become lists,
+            # which must not be converted back to the type of the set.
+            return narrowed_items
+
+        value = (
+            tuple(narrowed_items)
+            if isinstance(value, tuple)
+            else narrowed_items
+        )
 
-        if (
-            generic_type_mapping is not None
-            and key_type in generic_type_mapping.keys()
-        ):
-            target_type: Type = generic_type_mapping[key_type]
-            ctor = target_type
-            if target_type in __BUILT_IN_CONSTRUCTORS__.keys():
-                ctor = __BUILT_IN_CONSTRUCTORS__[target_type]
+    target_type: Optional[Type] = None
+    if generic_type_mapping is not None:
+        target_type = generic_type_mapping.get(key_type)
+    if target_type is not None:
+        ctor: Optional[Type] = _get_constructor(target_type)
+        if ctor is not None:
             value = ctor(value)
 
-        result[key] = value
+    return value
 
-    return result
 
+def _get_constructor(target_type: Type) -> Optional[Type]:
+    ctor: Type = __BUILT_IN_CONSTRUCTORS__.get(target_type, target_type)
+    if not isinstance(ctor, type) or isabstract(ctor):
+        return None
 
-def _is_namedtuple_class(clz: Type) -> bool:
-    clz_fields: Dict[str, Any] = clz.__dict__
-    has_asdict_method: bool = "_asdict" in clz_fields.keys()
-    has_fields_class_member: bool = "_fields" in clz_fields.keys()
-    return has_asdict_method and has_fields_class_member
+    return ctor
 
 
 def _is_namedtuple_instance(obj: Any) -> bool:
-    is_tuple: bool = isinstance(obj, tuple)
+    return (
+        isinstance(obj, tuple)
+        and hasattr(obj, "_asdict")
+        and hasattr(obj, "_fields")
+    )
 
-    return is_tuple and _is_namedtuple_class(obj.__class__)
+
+try:
+    # The compiled helpers replace the python versions defined above.
+    # pylint: disable=E0401,E0611
+    from ._fast import (  # noqa: F811
+        is_namedtuple_instance as _is_namedtuple_instance,
+        narrow_instance as _narrow_instance,
+    )
+except ImportError:
+    pass
@@ -7,11 +7,33 @@
 # License: 3-clause BSD, see https://opensource.org/licenses/BSD-3-Clause
 #
 from dataclasses import is_dataclass, fields
-from typing import NamedTuple, Tuple, List, FrozenSet, Dict, Type
+from typing import (
+    Any,
+    Callable,
+    Mapping,
+    Sequence,
+    NamedTuple,
+    Optional,
+    Tuple,
+    List,
+    FrozenSet,
+    Dict,
+    Type,
+)
+import collections
+import gc
 import sys
+import weakref
 
 import unittest
 import nt2dc
+import nt2dc.named_tuple
+from nt2dc.builtins import BuiltInReplacements
+
+try:
+    from nt2dc import _fast
+except ImportError:
+    _fast = None
 
 
 list_type = List[int]
@@ -48,6 +70,41 @@ class NamedTupleWithReplacement(NamedTuple):
     c: bool
 
 
+class NestedNamedTuple(NamedTuple):
+    a: str
+    b: SimpleNamedTuple
+    c: List[SimpleNamedTuple]
+    d: Optional[SimpleNamedTuple]
+    e: Any
+
+
+class DefaultNamedTuple(NamedTuple):
+    a: int
+    b: SimpleNamedTuple = None
+    c: List[SimpleNamedTuple] = None
+
+
+class ForwardRefNamedTuple(NamedTuple):
+    a: "SimpleNamedTuple"
+    b: List["SimpleNamedTuple"]
+
+
+class CallableNamedTuple(NamedTuple):
+    a: Callable[[int, SimpleNamedTuple], str]
+    b: Callable[[], int]
+    c: Callable[..., int]
+
+
+class AbstractNamedTuple(NamedTuple):
+    a: Sequence[int]
+    b: Mapping[str, int]
+
+
+class NestedMappingNamedTuple(NamedTuple):
+    a: Dict[str, SimpleNamedTuple]
+    b: Dict[str, List[Tuple[SimpleNamedTuple, ...]]]
+
+
 _ReplaceFrozenSetByList: Dict[Type, Type] = {}
 
 if sys.version_info.major == 3 and sys.version_info.minor >= 9:
@@ -61,6 +118,16 @@ class SimpleNamedTupleTest(unittest.TestCase):
         dc = nt2dc.make_dataclass(SimpleNamedTuple)
         self.assertTrue(is_dataclass(dc))
 
+    @unittest.skipIf(sys.version_info < (3, 11), "requires python 3.11")
+    def test_make_dataclass_slots(self):
+        dc = nt2dc.make_dataclass(SimpleNamedTuple)
+        self.assertEqual(dc.__slots__, ("a", "b", "c", "__weakref__"))
+
+    def test_convert_instance_weakref(self):
+        inst: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        new_inst, _ = nt2dc.get_dataclass_object(inst)
+        self.assertIs(weakref.ref(new_inst)(), new_inst)
+
     def test_make_dataclass_fields_a(self):
         dc = nt2dc.make_dataclass(SimpleNamedTuple)
         flds = fields(dc)
@@ -158,5 +225,284 @@ class NamedTupleWithReplacementTest(unittest.TestCase):
         self.assertEqual(new_inst.c, True)
 
 
+class SimpleNameTupleWithGenericTypesTest(unittest.TestCase):
+    def test_make_dataclass(self):
+        dc = nt2dc.make_dataclass(SimpleNameTupleWithGenericTypes)
+        self.assertTrue(is_dataclass(dc))
+
+    def test_make_dataclass_fields_d(self):
+        dc = nt2dc.make_dataclass(SimpleNameTupleWithGenericTypes)
+        flds = fields(dc)
+        self.assertEqual(flds[3].name, "d")
+        self.assertEqual(flds[3].type, tuple_type)
+
+    def test_make_dataclass_fields_e(self):
+        dc = nt2dc.make_dataclass(SimpleNameTupleWithGenericTypes)
+        flds = fields(dc)
+        self.assertEqual(flds[4].name, "e")
+        self.assertEqual(flds[4].type, dict_type)
+
+    def test_make_dataclass_fields_f(self):
+        dc = nt2dc.make_dataclass(SimpleNameTupleWithGenericTypes)
+        flds = fields(dc)
+        self.assertEqual(flds[5].name, "f")
+        self.assertEqual(flds[5].type, list_type)
+
+    def test_convert_instance_replace_copy(self):
+        inst: SimpleNameTupleWithGenericTypes = (
+            SimpleNameTupleWithGenericTypes(
+                1, 2.1, True, (1, 2.1, True), {"a": 1}, [1]
+            )
+        )
+        new_inst, _ = nt2dc.get_dataclass_object(inst, BuiltInReplacements)
+        self.assertEqual(new_inst.e, inst.e)
+        self.assertIsNot(new_inst.e, inst.e)
+        self.assertEqual(new_inst.f, inst.f)
+        self.assertIsNot(new_inst.f, inst.f)
+
+
+class NestedNamedTupleTest(unittest.TestCase):
+    def test_make_dataclass_fields_b(self):
+        dc = nt2dc.make_dataclass(NestedNamedTuple)
+        flds = fields(dc)
+        self.assertEqual(flds[1].name, "b")
+        self.assertEqual(flds[1].type, nt2dc.make_dataclass(SimpleNamedTuple))
+
+    def test_make_dataclass_fields_c(self):
+        dc = nt2dc.make_dataclass(NestedNamedTuple)
+        inner_dc = nt2dc.make_dataclass(SimpleNamedTuple)
+        flds = fields(dc)
+        self.assertEqual(flds[2].name, "c")
+        if sys.version_info.major == 3 and sys.version_info.minor >= 9:
+            self.assertEqual(flds[2].type, list[inner_dc])
+        else:
+            self.assertEqual(flds[2].type, List[inner_dc])
+
+    def test_convert_instance(self):
+        inner: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        inst: NestedNamedTuple = NestedNamedTuple(
+            "Hello", inner, [inner], inner, inner
+        )
+        new_inst, _ = nt2dc.get_dataclass_object(inst)
+        inner_dc = nt2dc.make_dataclass(SimpleNamedTuple)
+        self.assertEqual(new_inst.a, "Hello")
+        self.assertIsInstance(new_inst.b, inner_dc)
+        self.assertEqual(new_inst.b.a, 1)
+        self.assertIsInstance(new_inst.c, list)
+        self.assertIsInstance(new_inst.c[0], inner_dc)
+        self.assertEqual(new_inst.c[0].b, 2.1)
+        self.assertIsInstance(new_inst.d, inner_dc)
+        self.assertIsInstance(new_inst.e, inner_dc)
+
+    def test_convert_instance_any_set(self):
+        inner: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        inst: NestedNamedTuple = NestedNamedTuple(
+            "Hello", inner, [], None, frozenset([inner])
+        )
+        new_inst, _ = nt2dc.get_dataclass_object(inst)
+        inner_dc = nt2dc.make_dataclass(SimpleNamedTuple)
+        self.assertIsInstance(new_inst.e, list)
+        self.assertIsInstance(new_inst.e[0], inner_dc)
+
+    def test_convert_instance_any_set_replace(self):
+        inner: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        inst: NestedNamedTuple = NestedNamedTuple(
+            "Hello", inner, [], None, frozenset([inner])
+        )
+        new_inst, _ = nt2dc.get_dataclass_object(inst, BuiltInReplacements)
+        inner_dc = nt2dc.make_dataclass(SimpleNamedTuple, BuiltInReplacements)
+        self.assertIsInstance(new_inst.e, list)
+        self.assertIsInstance(new_inst.e[0], inner_dc)
+
+    def test_convert_instance_none(self):
+        inner: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        inst: NestedNamedTuple = NestedNamedTuple(
+            "Hello", inner, [], None, None
+        )
+        new_inst, _ = nt2dc.get_dataclass_object(inst)
+        self.assertEqual(new_inst.c, [])
+        self.assertIsNone(new_inst.d)
+        self.assertIsNone(new_inst.e)
+
+
+class DefaultNamedTupleTest(unittest.TestCase):
+    def test_convert_instance_none(self):
+        inst: DefaultNamedTuple = DefaultNamedTuple(1)
+        new_inst, _ = nt2dc.get_dataclass_object(inst)
+        self.assertEqual(new_inst.a, 1)
+        self.assertIsNone(new_inst.b)
+        self.assertIsNone(new_inst.c)
+
+    def test_convert_instance_plain_tuple(self):
+        inst: DefaultNamedTuple = DefaultNamedTuple(1, (1, 2.1, True))
+        new_inst, _ = nt2dc.get_dataclass_object(inst)
+        self.assertEqual(new_inst.b, (1, 2.1, True))
+
+    def test_convert_instance(self):
+        inner: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        inst: DefaultNamedTuple = DefaultNamedTuple(1, inner, [inner])
+        new_inst, _ = nt2dc.get_dataclass_object(inst)
+        inner_dc = nt2dc.make_dataclass(SimpleNamedTuple)
+        self.assertIsInstance(new_inst.b, inner_dc)
+        self.assertIsInstance(new_inst.c[0], inner_dc)
+
+
+class ForwardRefNamedTupleTest(unittest.TestCase):
+    def test_make_dataclass_fields(self):
+        dc = nt2dc.make_dataclass(ForwardRefNamedTuple)
+        inner_dc = nt2dc.make_dataclass(SimpleNamedTuple)
+        flds = fields(dc)
+        self.assertEqual(flds[0].type, inner_dc)
+        self.assertEqual(flds[1].type.__args__, (inner_dc,))
+
+    @unittest.skipIf(sys.version_info < (3, 9), "requires python 3.9")
+    def test_make_dataclass_annotated(self):
+        from typing import Annotated  # pylint: disable=C0415
+
+        class AnnotatedNamedTuple(NamedTuple):
+            a: Annotated[int, {"x": 1}]
+            b: List[Annotated[SimpleNamedTuple, 0]]
+
+        dc = nt2dc.make_dataclass(AnnotatedNamedTuple)
+        inner_dc = nt2dc.make_dataclass(SimpleNamedTuple)
+        flds = fields(dc)
+        self.assertEqual(flds[0].type, int)
+        self.assertEqual(flds[1].type, list[inner_dc])
+        inner: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        new_inst, _ = nt2dc.get_dataclass_object(
+            AnnotatedNamedTuple(1, [inner])
+        )
+        self.assertEqual(new_inst.a, 1)
+        self.assertIsInstance(new_inst.b[0], inner_dc)
+
+
+class CallableNamedTupleTest(unittest.TestCase):
+    def test_make_dataclass_fields(self):
+        dc = nt2dc.make_dataclass(CallableNamedTuple)
+        inner_dc = nt2dc.make_dataclass(SimpleNamedTuple)
+        flds = fields(dc)
+        self.assertEqual(flds[0].type.__args__, (int, inner_dc, str))
+        self.assertEqual(flds[1].type.__args__, (int,))
+        self.assertEqual(flds[2].type.__args__, (Ellipsis, int))
+
+    def test_convert_instance(self):
+        inst: CallableNamedTuple = CallableNamedTuple(str, int, len)
+        new_inst, _ = nt2dc.get_dataclass_object(inst)
+        self.assertIs(new_inst.a, str)
+        self.assertIs(new_inst.b, int)
+        self.assertIs(new_inst.c, len)
+
+
+class AbstractNamedTupleTest(unittest.TestCase):
+    def test_convert_instance(self):
+        inst: AbstractNamedTuple = AbstractNamedTuple([1, 2], {"a": 1})
+        new_inst, _ = nt2dc.get_dataclass_object(inst)
+        self.assertEqual(new_inst.a, [1, 2])
+        self.assertEqual(new_inst.b, {"a": 1})
+
+    def test_convert_instance_replace(self):
+        inst: AbstractNamedTuple = AbstractNamedTuple([1, 2], {"a": 1})
+        new_inst, _ = nt2dc.get_dataclass_object(inst, BuiltInReplacements)
+        self.assertEqual(new_inst.a, [1, 2])
+        self.assertEqual(new_inst.b, {"a": 1})
+
+
+class NestedMappingNamedTupleTest(unittest.TestCase):
+    def test_convert_instance(self):
+        inner: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        inst: NestedMappingNamedTuple = NestedMappingNamedTuple(
+            {"x": inner}, {"y": [(inner, inner)]}
+        )
+        new_inst, _ = nt2dc.get_dataclass_object(inst)
+        inner_dc = nt2dc.make_dataclass(SimpleNamedTuple)
+        self.assertIsInstance(new_inst.a["x"], inner_dc)
+        self.assertIsInstance(new_inst.b["y"][0], tuple)
+        self.assertIsInstance(new_inst.b["y"][0][1], inner_dc)
+
+
+class UntypedNamedTupleTest(unittest.TestCase):
+    def test_convert_instance(self):
+        clz = collections.namedtuple("Untyped", "a b")
+        with self.assertRaises(TypeError):
+            nt2dc.get_dataclass_object(clz(1, 2))
+
+
+class CacheTest(unittest.TestCase):
+
+    replace = _ReplaceFrozenSetByList
+
+    def test_make_dataclass_cached(self):
+        dc1 = nt2dc.make_dataclass(SimpleNamedTuple)
+        dc2 = nt2dc.make_dataclass(SimpleNamedTuple)
+        self.assertIs(dc1, dc2)
+
+    def test_make_dataclass_not_cached(self):
+        dc1 = nt2dc.make_dataclass(SimpleNamedTuple, use_cache=False)
+        dc2 = nt2dc.make_dataclass(SimpleNamedTuple, use_cache=False)
+        self.assertIsNot(dc1, dc2)
+
+    def test_make_dataclass_cached_by_mapping(self):
+        dc1 = nt2dc.make_dataclass(NamedTupleWithReplacement)
+        dc2 = nt2dc.make_dataclass(NamedTupleWithReplacement, self.replace)
+        self.assertIsNot(dc1, dc2)
+        self.assertEqual(fields(dc2)[1].type, list_type)
+
+    def test_make_dataclass_cached_by_name(self):
+        dc1 = nt2dc.make_dataclass(SimpleNamedTuple, prefix="My")
+        dc2 = nt2dc.make_dataclass(SimpleNamedTuple, suffix="Data")
+        self.assertEqual(dc1.__name__, "MySimpleNamedTupleDataClass")
+        self.assertEqual(dc2.__name__, "SimpleNamedTupleData")
+
+    def test_convert_instance_cached(self):
+        inst: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        _, dc1 = nt2dc.get_dataclass_object(inst)
+        _, dc2 = nt2dc.get_dataclass_object(inst)
+        self.assertIs(dc1, dc2)
+
+    def test_cache_does_not_keep_classes_alive(self):
+        clz = NamedTuple("Dynamic", [("a", int), ("b", List[int])])
+        _ = nt2dc.get_dataclass_object(clz(1, [2]))
+        ref = weakref.ref(clz)
+        del clz
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_convert_instance_cached_empty_mapping(self):
+        inst: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        _, dc1 = nt2dc.get_dataclass_object(inst, {})
+        target = SimpleNamedTuple.__dict__["__nt_as_dc_target__"]
+        _, dc2 = nt2dc.get_dataclass_object(inst, {})
+        self.assertIs(dc1, dc2)
+        self.assertIs(SimpleNamedTuple.__dict__["__nt_as_dc_target__"], target)
+
+    def test_clear_cache(self):
+        inst: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        _, dc1 = nt2dc.get_dataclass_object(inst)
+        nt2dc.named_tuple.clear_cache()
+        new_inst, dc2 = nt2dc.get_dataclass_object(inst)
+        self.assertIsNot(dc1, dc2)
+        self.assertIsInstance(new_inst, dc2)
+
+
+@unittest.skipIf(_fast is None, "requires the compiled nt2dc._fast module")
+class FastTest(unittest.TestCase):
+    def test_is_namedtuple_instance(self):
+        self.assertTrue(
+            _fast.is_namedtuple_instance(SimpleNamedTuple(1, 2.1, True))
+        )
+        self.assertFalse(_fast.is_namedtuple_instance((1, 2.1, True)))
+        self.assertFalse(_fast.is_namedtuple_instance(SimpleNamedTuple))
+
+    def test_narrow_instance(self):
+        inst: SimpleNamedTuple = SimpleNamedTuple(1, 2.1, True)
+        narrowed = _fast.narrow_instance(inst, (None, str, None))
+        self.assertEqual(narrowed, [1, "2.1", True])
+
+    def test_used_by_named_tuple(self):
+        self.assertIs(
+            nt2dc.named_tuple._narrow_instance, _fast.narrow_instance
+        )
+
+
 if __name__ == "__main__":
     unittest.main()